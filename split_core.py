@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Gemeinsamer Kern der Split-Skripte: exportiert jeden Layer einer
+.drawio-Datei in eine eigene .drawio-Datei. split.py, split_gpt.py und
+split_grok_2.py sind nur noch dünne CLI-Wrapper um dieses Modul."""
+try:
+    from lxml import etree as ET
+    _PARSER = ET.XMLParser(huge_tree=True, remove_blank_text=False)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _PARSER = None
+import io
+import os
+import re
+import argparse
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+_SANITIZE_RE = re.compile(r'[^\w\-_\.]+')
+
+# Einzige Tags, die _parse_source auf Python-Ebene sehen muss; mit lxml
+# filtert libxml2 alle Zell-Events bereits auf C-Ebene weg
+_PARSE_TAGS = ('mxfile', 'diagram', 'mxGraphModel', 'root')
+
+def sanitize_filename(name: str) -> str:
+    if not name:
+        name = "Unnamed_Layer"
+    return _SANITIZE_RE.sub('_', name).strip("_")
+
+def _parse_source(input_file: str):
+    """Parse die Eingabe per iterparse statt als vollständigen DOM:
+    behalten werden nur die Attribute von <mxfile>/<diagram>/<mxGraphModel>
+    und der <root> des ersten Diagramms; weitere Diagramme werden nach dem
+    Auslesen sofort wieder freigegeben."""
+    mxfile_attrib = None
+    diagram_attrib = None
+    mgm_attrib = None
+    mx_root_src = None
+    diagram_count = 0
+    if _PARSER is not None:
+        events = ET.iterparse(input_file, events=('start', 'end'),
+                              tag=_PARSE_TAGS, huge_tree=True)
+    else:
+        events = ET.iterparse(input_file, events=('start', 'end'))
+    for event, elem in events:
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'diagram':
+                diagram_count += 1
+                if diagram_count == 1:
+                    diagram_attrib = dict(elem.attrib)
+            elif tag == 'mxfile':
+                mxfile_attrib = dict(elem.attrib)
+            continue
+        # 'end'-Events: nur das erste Diagramm wird exportiert
+        if diagram_count == 1:
+            if tag == 'mxGraphModel' and mgm_attrib is None:
+                mgm_attrib = dict(elem.attrib)
+            elif tag == 'root' and mx_root_src is None:
+                mx_root_src = elem
+        elif tag == 'diagram':
+            elem.clear()
+    if diagram_attrib is None:
+        raise ValueError("Kein <diagram> gefunden.")
+    if mgm_attrib is None or mx_root_src is None:
+        raise ValueError("Kein <mxGraphModel> gefunden.")
+    if mxfile_attrib is None:
+        mxfile_attrib = {}
+    return mxfile_attrib, diagram_attrib, mgm_attrib, mx_root_src
+
+def _build_indices(mx_root: ET.Element):
+    id_index = {}
+    children = defaultdict(list)
+    # (id, source, target) aller Kanten als flache Tupel, damit der
+    # Cross-Edge-Scan pro Layer reine dict/set-Operationen bleibt
+    edges = []
+    # Layer (mxCell mit parent="0") gleich mit einsammeln, damit kein
+    # zweiter XPath-Durchlauf nötig ist
+    layers = []
+    for el in mx_root.iter():
+        attrib = el.attrib
+        el_id = attrib.get('id')
+        if el_id:
+            id_index[el_id] = el
+            if el.tag == 'mxCell' and attrib.get('edge') == '1':
+                edges.append((el_id, attrib.get('source'), attrib.get('target')))
+        parent = attrib.get('parent')
+        if parent:
+            children[parent].append(el)
+            if parent == "0" and el.tag == 'mxCell':
+                layers.append(el)
+    return id_index, children, edges, layers
+
+def _build_top_layer_table(id_index: dict) -> dict:
+    """Baue einmalig die Tabelle id -> Top-Layer-ID (direktes Kind von "0").
+    Ein Durchlauf mit Pfadkompression: jede Parent-Kette wird nur einmal
+    verfolgt, alle Glieder erben das Ergebnis."""
+    parent_of = {el_id: el.attrib.get('parent') for el_id, el in id_index.items()}
+    top_of = {}
+    for el_id in parent_of:
+        chain = []
+        seen = set()
+        cur = el_id
+        top = None
+        while cur not in top_of:
+            chain.append(cur)
+            seen.add(cur)
+            pid = parent_of.get(cur)
+            if not pid or pid in seen:  # kein Parent bzw. Zyklus
+                break
+            if pid == "0":
+                top = cur  # cur ist selbst der Layer
+                break
+            cur = pid
+        else:
+            top = top_of[cur]
+        for chain_id in chain:
+            top_of[chain_id] = top
+    return top_of
+
+def _top_layer_id(el: ET.Element, top_of: dict) -> str | None:
+    """Top-Layer-ID eines Elements, O(1) über die vorberechnete Tabelle."""
+    return top_of.get(el.attrib.get('id'))
+
+def _collect_cells_for_layer(layer_id: str, id_index: dict, children: dict):
+    """
+    Menge aller mxCell, deren Top-ancestor-Layer = layer_id ist (vollständig transitiv).
+    """
+    result_ids = set()
+    queue = deque((layer_id,))
+    while queue:
+        cur = queue.popleft()
+        if cur in result_ids:
+            continue
+        result_ids.add(cur)
+        for child in children.get(cur, []):
+            cid = child.attrib.get('id')
+            if cid:
+                queue.append(cid)
+    return result_ids
+
+def _fast_clone(el: ET.Element, parent: ET.Element) -> ET.Element:
+    """Flache Rekonstruktion eines Elements unter `parent` statt deepcopy:
+    Attribute als dict kopieren, Kinder rekursiv neu anlegen."""
+    new = ET.SubElement(parent, el.tag, dict(el.attrib))
+    new.text = el.text
+    new.tail = el.tail
+    for child in el:
+        _fast_clone(child, new)
+    return new
+
+def _export_layer(mxfile_out: dict,
+                  diag_id: str,
+                  mgm_attrib: dict,
+                  base_cells: list,
+                  id_index: dict,
+                  children: dict,
+                  edges: list,
+                  layer_elem: ET.Element,
+                  output_dir: str):
+    layer_id = layer_elem.attrib.get('id')
+    layer_label = layer_elem.attrib.get('value') or 'Unnamed_Layer'
+
+    # Basismenge: alles mit Top-Ancestor = layer_id
+    in_layer_ids = _collect_cells_for_layer(layer_id, id_index, children)
+
+    # Zusatzeinschluss: Kanten (edge="1"), deren source/target in der Basismenge liegen,
+    # auch wenn deren parent in einem anderen Layer liegt -> parent nach layer_id umhängen.
+    cross_edge_ids = set()
+    for el_id, src, tgt in edges:
+        if (src and src in in_layer_ids) or (tgt and tgt in in_layer_ids):
+            cross_edge_ids.add(el_id)
+
+    # Auch zugehörige Edge-Labels (parent=edge-id) aufnehmen.
+    for edge_id in list(cross_edge_ids):
+        for possible_label in children.get(edge_id, []):
+            if possible_label.tag == 'mxCell':
+                cross_edge_ids.add(possible_label.attrib.get('id'))
+
+    # Auszugebende Zellen einsammeln: (Element, umgehängter parent oder None).
+    # Ein einziger Durchlauf über die Vereinigungsmenge; die Basiszellen und
+    # die Layer-Zelle selbst sind bereits gesetzt. Cross-Layer-Kanten werden
+    # nach layer_id umgehängt, damit der Export eine valide Hierarchie besitzt.
+    base_ids = {"0", "1", layer_id}
+    cells = [(base, None) for base in base_cells]
+    cells.append((layer_elem, None))
+
+    # In Dokumentreihenfolge über id_index laufen statt über die (hash-
+    # randomisierte) Vereinigungsmenge: so ist die Ausgabe über Läufe hinweg
+    # byte-stabil und der Unverändert-Vergleich unten kann greifen.
+    wanted = in_layer_ids | cross_edge_ids
+    for el_id, el in id_index.items():
+        if el_id not in wanted or el_id in base_ids:
+            continue
+        needs_reparent = (el_id not in in_layer_ids
+                          and el.attrib.get('parent') != layer_id)
+        cells.append((el, layer_id if needs_reparent else None))
+
+    diagram_out = {'name': layer_label, 'id': diag_id}
+
+    # Erst in den Speicher serialisieren: ein write()-Syscall pro Datei, und
+    # der Inhalt lässt sich gegen eine vorhandene Datei vergleichen.
+    buf = io.BytesIO()
+    if _PARSER is not None:
+        _write_layer_stream(buf, mxfile_out, diagram_out, mgm_attrib, cells)
+    else:
+        _write_layer_dom(buf, mxfile_out, diagram_out, mgm_attrib, cells)
+    data = buf.getvalue()
+
+    out_path = f"{output_dir}{os.sep}{sanitize_filename(layer_label)}.drawio"
+
+    # Unveränderte Dateien bei Wiederholungsläufen nicht neu schreiben
+    try:
+        with open(out_path, 'rb') as f:
+            if f.read() == data:
+                print(f"Layer '{layer_label}' unchanged, kept '{out_path}'")
+                return
+    except FileNotFoundError:
+        pass
+
+    # Atomar über eine temporäre Datei ersetzen: kein halb geschriebener
+    # Export, falls der Prozess mitten im Schreiben abbricht
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, out_path)
+    print(f"Exported layer '{layer_label}' to '{out_path}'")
+
+def _write_layer_stream(f, mxfile_out: dict, diagram_out: dict,
+                        mgm_attrib: dict, cells: list):
+    """Inkrementelle Serialisierung über lxml.etree.xmlfile: die Quell-
+    Elemente werden direkt herausgeschrieben, ohne je einen Zielbaum
+    aufzubauen."""
+    with ET.xmlfile(f, encoding='utf-8') as xf:
+        xf.write_declaration()
+        with xf.element('mxfile', mxfile_out):
+            with xf.element('diagram', diagram_out):
+                with xf.element('mxGraphModel', mgm_attrib):
+                    with xf.element('root'):
+                        for el, override in cells:
+                            if override is None:
+                                xf.write(el)
+                            else:
+                                attrib = dict(el.attrib)
+                                attrib['parent'] = override
+                                with xf.element(el.tag, attrib):
+                                    for child in el:
+                                        xf.write(child)
+
+def _write_layer_dom(f, mxfile_out: dict, diagram_out: dict,
+                     mgm_attrib: dict, cells: list):
+    """Fallback ohne lxml: Zielbaum klassisch aufbauen und am Stück schreiben."""
+    new_mxfile = ET.Element('mxfile', attrib=mxfile_out)
+    new_diagram = ET.SubElement(new_mxfile, 'diagram', attrib=diagram_out)
+    new_mgm = ET.SubElement(new_diagram, 'mxGraphModel', attrib=mgm_attrib)
+    new_root = ET.SubElement(new_mgm, 'root')
+    for el, override in cells:
+        el_copy = _fast_clone(el, new_root)
+        if override is not None:
+            el_copy.attrib['parent'] = override
+    ET.ElementTree(new_mxfile).write(f, encoding='utf-8', xml_declaration=True)
+
+# Pro Worker-Prozess einmal aufgebauter Zustand (Quellbaum + Indizes)
+_WORKER_STATE = {}
+
+def _init_worker(blob: bytes, mxfile_out: dict, diag_id: str,
+                 mgm_attrib: dict, output_dir: str):
+    mx_root_src = ET.fromstring(blob)
+    id_index, children, edges, _ = _build_indices(mx_root_src)
+    base_cells = [id_index[b] for b in ("0", "1") if b in id_index]
+    _WORKER_STATE.update(
+        mxfile_out=mxfile_out, diag_id=diag_id,
+        mgm_attrib=mgm_attrib, base_cells=base_cells,
+        id_index=id_index, children=children, edges=edges,
+        output_dir=output_dir)
+
+def _export_layer_by_id(layer_id: str):
+    s = _WORKER_STATE
+    _export_layer(s['mxfile_out'], s['diag_id'], s['mgm_attrib'],
+                  s['base_cells'], s['id_index'], s['children'], s['edges'],
+                  s['id_index'][layer_id], s['output_dir'])
+
+def export_layers(input_file: str, output_dir: str, jobs: int | None = None):
+    os.makedirs(output_dir, exist_ok=True)
+
+    mxfile_attrib, diagram_attrib, mgm_attrib, mx_root_src = _parse_source(input_file)
+
+    id_index, children, edges, layers = _build_indices(mx_root_src)
+
+    if not layers:
+        raise ValueError("Keine Layer gefunden (mxCell mit parent='0').")
+
+    # Basiszellen ("0", "1") einmal nachschlagen statt pro Layer per find()
+    base_cells = [id_index[b] for b in ("0", "1") if b in id_index]
+
+    # Ausgabe-Attribute (inkl. Defaults) einmal auflösen statt pro Layer
+    mxfile_out = {
+        'host': mxfile_attrib.get('host', 'app.diagrams.net'),
+        'agent': mxfile_attrib.get('agent', ''),
+        'version': mxfile_attrib.get('version', '28.0.7')
+    }
+    diag_id = diagram_attrib.get('id', 'default_id')
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    layer_ids = [layer_elem.attrib.get('id') for layer_elem in layers]
+
+    if jobs <= 1 or len(layers) <= 1 or None in layer_ids:
+        for layer_elem in layers:
+            _export_layer(mxfile_out, diag_id, mgm_attrib, base_cells,
+                          id_index, children, edges, layer_elem, output_dir)
+        return
+
+    # Layer sind unabhängig: einmal serialisierten Quellbaum an die Worker
+    # geben, jeder Worker parst und indiziert ihn einmal im Initializer.
+    blob = ET.tostring(mx_root_src)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(layers)),
+                             initializer=_init_worker,
+                             initargs=(blob, mxfile_out, diag_id,
+                                       mgm_attrib, output_dir)) as executor:
+        list(executor.map(_export_layer_by_id, layer_ids))
+
+def main():
+    parser = argparse.ArgumentParser(description='Exportiert Layer aus einer .drawio-Datei in einzelne .drawio-Dateien.')
+    parser.add_argument('--input_file', required=True, help='Pfad zur Eingabe-.drawio')
+    parser.add_argument('--output_dir', required=True, help='Zielordner')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Anzahl paralleler Export-Prozesse (Standard: CPU-Anzahl)')
+    args = parser.parse_args()
+    export_layers(args.input_file, args.output_dir, jobs=args.jobs)
+
+if __name__ == '__main__':
+    main()